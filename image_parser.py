@@ -1,8 +1,17 @@
 # comfy_parser.py made by nenya
 import json
+import string
+import sys
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError: # Optional speedup, the stdlib parser is used without it
+    orjson = None # type: ignore[assignment]
 
 # --- Constants ---
 COMFY_METADATA_PROPAGATE_NONE = True # If a node required for propagation is None, stop propagation
+_IN_PROGRESS = object() # Memo marker for a link that is still being resolved
 
 # --- Data Structures ---
 comfy_nodes_propagation_data = [
@@ -224,6 +233,12 @@ format_of_comfy_fields_to_types = {
     'loras': ['<{lora_name}> (Strength: {strength_model:.2f})'],
 }
 
+# PrimitiveNode titles in the workflow graph whose value overrides a resolved field
+primitive_node_override_fields = {
+    'positive': 'pos_prompts',
+    'negative': 'neg_prompts',
+}
+
 comfy_fields_pretty_names = {
     # ... (Keep the entire dict from the original code here) ...
     'models': "Model",
@@ -239,122 +254,353 @@ comfy_fields_pretty_names = {
     'denoise': "Denoise",
 }
 
-# --- Helper Functions ---
-def custom_operation(operation_data, input_object):
-    """Performs custom operations defined in the mapping data."""
-    op_type = operation_data.get('operation_type')
-    op_input = operation_data.get('operation_input')
-
-    if op_type == "any_of_inputs":
-        return input_object in op_input
-    elif op_type == "format":
-        format_str = op_input
-        # Ensure all keys exist, providing a default if necessary
-        keys_to_use = operation_data.get('keys_to_use', [])
-        format_args = {key: input_object.get(key, f"{{{key}}}") for key in keys_to_use}
-        try:
-            return format_str.format(**format_args)
-        except KeyError as e:
-            print(f"Warning: Missing key for formatting: {e}")
-            return format_str # Return unformatted string on error
-    elif op_type == "caseless_contains":
-        return isinstance(input_object, str) and op_input.lower() in input_object.lower()
-    else:
-        print(f"Warning: Unknown custom operation type: {op_type}")
-        return None # Or raise an error
-
-def resolve_class_type(node_type, list_of_formats):
-    """Finds the matching format definition for a given node class type."""
+# --- Lookup Tables ---
+def _build_class_type_index(list_of_formats):
+    """Flattens a list of node formats into a {class_type: node_format} dict."""
+    index = {}
     for node_format in list_of_formats:
         class_type_def = node_format['class_type']
         if isinstance(class_type_def, str):
-            if class_type_def == node_type:
-                return node_format
-        elif isinstance(class_type_def, dict): # Custom operation
-            if custom_operation(class_type_def, node_type):
-                return node_format
+            index.setdefault(sys.intern(class_type_def), node_format)
+        elif isinstance(class_type_def, dict) and class_type_def.get('operation_type') == 'any_of_inputs':
+            class_type_def['_set'] = frozenset(class_type_def.get('operation_input', []))
+            for class_name in class_type_def.get('operation_input', []):
+                # setdefault keeps the first match, same as the old linear scan
+                index.setdefault(sys.intern(class_name), node_format)
         else:
             print(f"Warning: Unknown class_type format: {class_type_def}")
+    return index
+
+_PROPAGATION_BY_TYPE = _build_class_type_index(comfy_nodes_propagation_data)
+_TARGET_BY_TYPE = _build_class_type_index(target_comfy_nodes)
+_TARGET_TYPE_NAMES = frozenset(_TARGET_BY_TYPE)
+
+_INT_FORMAT_TYPES = frozenset('bcdoxX')
+_NUMBER_FORMAT_TYPES = frozenset('eEfFgGn%')
+
+def _compile_format(format_str):
+    """
+    Compiles a str.format template into (required_keys, type_checks, format_fn).
+    format_fn(params) is an equivalent f-string reading straight from params,
+    and type_checks lists (key, types) pairs for fields with a numeric spec
+    like {cfg:.1f}, so callers can skip values that would fail to format.
+    When some spec isn't covered by a type check (e.g. {steps:>4}, which
+    fails on None), format_fn returns None instead of raising.
+    Templates using attribute/index lookups or nested specs fall back to
+    str.format, with the same None on failure.
+    """
+    parsed = list(string.Formatter().parse(format_str))
+    field_names = [field_name for _, field_name, _, _ in parsed if field_name is not None]
+    unsupported = False
+    needs_guard = False # Some spec can fail for a value the type checks let through
+    value_types = {}
+    for _, field_name, format_spec, conversion in parsed:
+        if field_name is None:
+            continue
+        if not field_name.isidentifier() or any(c in format_spec for c in '{}\'"\\'):
+            unsupported = True
+            break
+        type_char = format_spec[-1:]
+        if type_char in _INT_FORMAT_TYPES or type_char in _NUMBER_FORMAT_TYPES:
+            if conversion:
+                unsupported = True # Numeric spec applied to a converted string
+                break
+            if type_char in _INT_FORMAT_TYPES:
+                value_types[field_name] = int
+            else:
+                value_types.setdefault(field_name, (int, float))
+            try:
+                format(0, format_spec) # Catches specs invalid for any value, like {steps:.1d}
+            except ValueError:
+                needs_guard = True
+            if type_char == 'c':
+                needs_guard = True # Out of range code points
+        elif format_spec:
+            needs_guard = True
+
+    if unsupported:
+        def format_fn(params):
+            try:
+                return format_str.format(**params)
+            except (KeyError, TypeError, ValueError):
+                return None
+        root_names = frozenset(field_name.split('.')[0].split('[')[0] for field_name in field_names)
+        return root_names, (), format_fn
+
+    local_names = {}
+    pieces = []
+    for literal_text, field_name, format_spec, conversion in parsed:
+        pieces.append(literal_text.replace('{', '{{').replace('}', '}}'))
+        if field_name is None:
+            continue
+        local_name = local_names.setdefault(field_name, f"_{len(local_names)}")
+        conversion = f"!{conversion}" if conversion else ""
+        format_spec = f":{format_spec}" if format_spec else ""
+        pieces.append(f"{{{local_name}{conversion}{format_spec}}}")
+
+    source = "def format_fn(params):\n"
+    for field_name, local_name in local_names.items():
+        source += f"    {local_name} = params[{field_name!r}]\n"
+    if needs_guard:
+        source += "    try:\n"
+        source += f"        return f{''.join(pieces)!r}\n"
+        source += "    except (TypeError, ValueError, OverflowError):\n"
+        source += "        return None\n"
+    else:
+        source += f"    return f{''.join(pieces)!r}\n"
+    namespace = {}
+    exec(source, namespace)
+    return frozenset(field_names), tuple(value_types.items()), namespace['format_fn']
+
+_COMPILED_FORMATS = {
+    field_type: [_compile_format(format_str) for format_str in format_strings]
+    for field_type, format_strings in format_of_comfy_fields_to_types.items()
+}
+
+def _formats_for_inputs(inputs):
+    """Lists (field_type, required_keys, type_checks, format_fn) for every compiled format the given inputs can satisfy."""
+    input_set = frozenset(inputs)
+    return [
+        (field_type, required_keys, type_checks, format_fn)
+        for field_type, compiled_formats in _COMPILED_FORMATS.items()
+        for required_keys, type_checks, format_fn in compiled_formats
+        if required_keys <= input_set
+    ]
+
+def _has_value_types(params, type_checks):
+    """Checks every (key, types) pair from a compiled format against the params."""
+    for key, value_types in type_checks:
+        if not isinstance(params[key], value_types):
+            return False
+    return True
+
+_PRETTY = {
+    field_type: comfy_fields_pretty_names.get(field_type, field_type.replace('_', ' ').title())
+    for field_type in format_of_comfy_fields_to_types
+}
+
+_FORMATS_FOR_CLASS = {
+    class_name: _formats_for_inputs(node_format.get('inputs', []))
+    for class_name, node_format in _TARGET_BY_TYPE.items()
+}
+
+# --- Helper Functions ---
+def load_json(text: str) -> Any:
+    """json.loads, backed by orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass # orjson rejects NaN/Infinity and >64-bit ints that json.dumps can write
+    return json.loads(text)
+
+def pretty_print_json(text: str) -> str:
+    """Re-indents a JSON string, with orjson when it is installed. Raises json.JSONDecodeError if it isn't valid JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(orjson.loads(text), option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONDecodeError:
+            pass # Same fallback as load_json, orjson also only indents by 2
+    return json.dumps(json.loads(text), indent=4)
+
+def looks_like_json(text: str) -> bool:
+    """Checks if the first non-whitespace character is '{' without copying the string."""
+    i = 0
+    n = len(text)
+    while i < n and text[i] in ' \t\r\n':
+        i += 1
+    return i < n and text[i] == '{'
+
+def _op_any_of_inputs(operation_data: dict, input_object: Any) -> Any:
+    options: Any = operation_data.get('_set') # frozenset prepared at import, see _build_class_type_index
+    if options is None:
+        options = operation_data.get('operation_input')
+    try:
+        return input_object in options
+    except TypeError: # Unhashable input tested against the frozenset
+        return input_object in operation_data['operation_input']
+
+def _op_format(operation_data: dict, input_object: Any) -> Any:
+    format_str: Any = operation_data.get('operation_input')
+    # Ensure all keys exist, providing a default if necessary
+    keys_to_use = operation_data.get('keys_to_use', [])
+    format_args = {key: input_object.get(key, f"{{{key}}}") for key in keys_to_use}
+    try:
+        return format_str.format(**format_args)
+    except KeyError as e:
+        print(f"Warning: Missing key for formatting: {e}")
+        return format_str # Return unformatted string on error
+
+def _op_caseless_contains(operation_data: dict, input_object: Any) -> Any:
+    op_input: Any = operation_data.get('operation_input')
+    return isinstance(input_object, str) and op_input.lower() in input_object.lower()
+
+_OPS = {
+    'any_of_inputs': _op_any_of_inputs,
+    'format': _op_format,
+    'caseless_contains': _op_caseless_contains,
+}
 
-    return None
+def custom_operation(operation_data: dict, input_object: Any) -> Any:
+    """Performs custom operations defined in the mapping data."""
+    op_type: Any = operation_data.get('operation_type')
+    op = _OPS.get(op_type)
+    if op is None:
+        print(f"Warning: Unknown custom operation type: {op_type}")
+        return None # Or raise an error
+    return op(operation_data, input_object)
 
-def is_comfy_link(obj):
+def resolve_class_type(node_type: Any, format_index: dict) -> Optional[dict]:
+    """Finds the matching format definition for a given node class type."""
+    try:
+        return format_index.get(node_type)
+    except TypeError: # Unhashable class_type in a malformed graph
+        return None
+
+def is_comfy_link(obj: Any) -> bool:
     """Checks if an object represents a ComfyUI node link."""
-    return isinstance(obj, list) and len(obj) == 2 and isinstance(obj[0], str) and isinstance(obj[1], int)
+    # Exact type checks: parsed JSON never contains list/str/int subclasses
+    return type(obj) is list and len(obj) == 2 and type(obj[0]) is str and type(obj[1]) is int
+
+def resolve_bypasses(comfy_link: Any, workflow_data: dict, memo: Optional[dict] = None) -> Any:
+    """
+    Resolves links through bypass/passthrough nodes.
+    Passthrough hops are followed in a loop; only formatting nodes, which fan
+    out to several inputs, recurse. Results are cached in `memo` by
+    (node_id, output_index), so nodes shared by several paths (e.g. one
+    checkpoint feeding model, clip and vae) are only walked once per graph.
+    Pass the same dict for every link of one graph.
+    """
+    if memo is None:
+        memo = {}
+
+    chain = [] # Links followed so far; they all resolve to the same value
+    result = None
+    while True:
+        if comfy_link is None:
+            break
+
+        # Inlined is_comfy_link, this runs for every hop
+        if not (type(comfy_link) is list and len(comfy_link) == 2
+                and type(comfy_link[0]) is str and type(comfy_link[1]) is int):
+            result = comfy_link # Value is not a link, return as is
+            break
+
+        linked_node_id = comfy_link[0]
+        linked_node_input_id = comfy_link[1]
+
+        key = (linked_node_id, linked_node_input_id)
+        if key in memo:
+            result = memo[key]
+            if result is _IN_PROGRESS:
+                result = None # A link back into itself ends propagation
+            break
+        memo[key] = _IN_PROGRESS
+        chain.append(key)
+
+        # Check if the linked node exists in the workflow data
+        if linked_node_id not in workflow_data:
+            # print(f"Warning: Linked node ID '{linked_node_id}' not found in workflow data.")
+            result = f"Error: Missing node {linked_node_id}" # Indicate missing node
+            break
+
+        linked_node = workflow_data[linked_node_id]
+        if not linked_node or 'class_type' not in linked_node:
+            # print(f"Warning: Invalid linked node data for ID '{linked_node_id}'.")
+            result = f"Error: Invalid node {linked_node_id}" # Indicate invalid node data
+            break
+
+        linked_node_type = linked_node['class_type']
+
+        # Find if this node type is defined for propagation
+        propagation_rule = resolve_class_type(linked_node_type, _PROPAGATION_BY_TYPE)
+        if propagation_rule is None:
+            # This node type doesn't propagate, so we stop here (or maybe return an identifier?)
+            # Depending on desired behavior, you might return None or something else.
+            # For now, returning None as it signifies the end of this propagation path.
+            break
+
+        propagation_mapping = propagation_rule.get('mapping') or {}
+        # Check if the specific input ID has a mapping rule
+        if linked_node_input_id not in propagation_mapping:
+            # print(f"Warning: No mapping found for input ID {linked_node_input_id} in node type '{linked_node_type}'.")
+            break # No rule for this specific output of the node
+
+        mapping_result = propagation_mapping[linked_node_input_id]
+        node_inputs = linked_node.get('inputs') or {}
+
+        if isinstance(mapping_result, str): # Simple key mapping
+            input_key_to_follow = mapping_result
+            if input_key_to_follow not in node_inputs:
+                # print(f"Warning: Mapped input key '{input_key_to_follow}' not found in node '{linked_node_id}'.")
+                break # The required input doesn't exist on the node
+            comfy_link = node_inputs[input_key_to_follow]
+            continue # Follow the passthrough without growing the call stack
+
+        elif isinstance(mapping_result, dict): # Custom operation (like formatting)
+            result = _resolve_format_mapping(mapping_result, linked_node_id, linked_node_type, node_inputs, workflow_data, memo)
 
-def resolve_bypasses(comfy_link, workflow_data):
-    """Recursively resolves links through bypass/passthrough nodes."""
-    if comfy_link is None:
+        else:
+            print(f"Warning: Unknown mapping result type for node type '{linked_node_type}': {mapping_result}")
+        break
+
+    for key in chain:
+        memo[key] = result
+    return result
+
+def _resolve_format_mapping(mapping_result: dict, linked_node_id: str, linked_node_type: Any,
+                            node_inputs: dict, workflow_data: dict, memo: dict) -> Any:
+    """Resolves every key a formatting mapping needs and applies the operation."""
+    resolved_keys = {}
+    keys_to_use = mapping_result.get('keys_to_use', [])
+    if not keys_to_use:
+        print(f"Warning: Formatting rule found for node type '{linked_node_type}' but no 'keys_to_use' defined.")
         return None
 
-    if not is_comfy_link(comfy_link):
-        return comfy_link # Value is not a link, return as is
+    for key in keys_to_use:
+        if key not in node_inputs:
+            print(f"Warning: Key '{key}' needed for formatting not found in inputs of node '{linked_node_id}'.")
+            if COMFY_METADATA_PROPAGATE_NONE:
+                return None
+            resolved_keys[key] = f"{{{key}}}" # Use placeholder if not propagating None
+            continue # Skip resolving this key
 
-    linked_node_id = comfy_link[0]
-    linked_node_input_id = comfy_link[1]
+        resolved_value = resolve_bypasses(node_inputs[key], workflow_data, memo)
+        if COMFY_METADATA_PROPAGATE_NONE and resolved_value is None:
+            return None # Stop propagation if any required key resolves to None
+        resolved_keys[key] = resolved_value if resolved_value is not None else f"{{{key}}}" # Use placeholder if None
 
-    # Check if the linked node exists in the workflow data
-    if linked_node_id not in workflow_data:
-        # print(f"Warning: Linked node ID '{linked_node_id}' not found in workflow data.")
-        return f"Error: Missing node {linked_node_id}" # Indicate missing node
+    # Perform the custom operation (e.g., formatting)
+    return custom_operation(mapping_result, resolved_keys)
 
-    linked_node = workflow_data[linked_node_id]
-    if not linked_node or 'class_type' not in linked_node:
-        # print(f"Warning: Invalid linked node data for ID '{linked_node_id}'.")
-        return f"Error: Invalid node {linked_node_id}" # Indicate invalid node data
+class LazyInputs:
+    """
+    Read-only mapping over a target node's inputs. Each input link is resolved
+    with resolve_bypasses the first time a format reads it, so inputs that no
+    format ends up using are never walked.
+    """
 
-    linked_node_type = linked_node['class_type']
+    def __init__(self, node_inputs: dict, input_keys: list, workflow_data: dict, memo: dict):
+        self._node_inputs = node_inputs
+        self._keys = frozenset(key for key in input_keys if key in node_inputs)
+        self._workflow_data = workflow_data
+        self._memo = memo
+        self._resolved: dict = {}
 
-    # Find if this node type is defined for propagation
-    propagation_rule = resolve_class_type(linked_node_type, comfy_nodes_propagation_data)
-    if propagation_rule is None:
-        # This node type doesn't propagate, so we stop here (or maybe return an identifier?)
-        # Depending on desired behavior, you might return None or something else.
-        # For now, returning None as it signifies the end of this propagation path.
-        return None
+    def keys(self) -> frozenset:
+        return self._keys
 
-    mapping = propagation_rule.get('mapping', {})
-    # Check if the specific input ID has a mapping rule
-    if linked_node_input_id not in mapping:
-        # print(f"Warning: No mapping found for input ID {linked_node_input_id} in node type '{linked_node_type}'.")
-        return None # No rule for this specific output of the node
-
-    mapping_result = mapping[linked_node_input_id]
-
-    if isinstance(mapping_result, str): # Simple key mapping
-        input_key_to_follow = mapping_result
-        if input_key_to_follow not in linked_node.get('inputs', {}):
-            # print(f"Warning: Mapped input key '{input_key_to_follow}' not found in node '{linked_node_id}'.")
-            return None # The required input doesn't exist on the node
-        new_link = linked_node['inputs'][input_key_to_follow]
-        return resolve_bypasses(new_link, workflow_data) # Recurse
-
-    elif isinstance(mapping_result, dict): # Custom operation (like formatting)
-        resolved_keys = {}
-        keys_to_use = mapping_result.get('keys_to_use', [])
-        if not keys_to_use:
-            print(f"Warning: Formatting rule found for node type '{linked_node_type}' but no 'keys_to_use' defined.")
-            return None
-
-        for key in keys_to_use:
-            if key not in linked_node.get('inputs', {}):
-                print(f"Warning: Key '{key}' needed for formatting not found in inputs of node '{linked_node_id}'.")
-                if COMFY_METADATA_PROPAGATE_NONE:
-                    return None
-                resolved_keys[key] = f"{{{key}}}" # Use placeholder if not propagating None
-                continue # Skip resolving this key
-
-            resolved_value = resolve_bypasses(linked_node['inputs'][key], workflow_data)
-            if COMFY_METADATA_PROPAGATE_NONE and resolved_value is None:
-                return None # Stop propagation if any required key resolves to None
-            resolved_keys[key] = resolved_value if resolved_value is not None else f"{{{key}}}" # Use placeholder if None
-
-        # Perform the custom operation (e.g., formatting)
-        return custom_operation(mapping_result, resolved_keys)
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
 
-    else:
-        print(f"Warning: Unknown mapping result type for node type '{linked_node_type}': {mapping_result}")
-        return None
+    def __getitem__(self, key: Any) -> Any:
+        resolved = self._resolved
+        if key in resolved:
+            return resolved[key]
+        if key not in self._keys:
+            raise KeyError(key)
+        value = resolved[key] = resolve_bypasses(self._node_inputs[key], self._workflow_data, self._memo)
+        return value
 
 # --- Main Parsing Function ---
 def comfyui_get_data(image_info: dict) -> dict:
@@ -370,9 +616,9 @@ def comfyui_get_data(image_info: dict) -> dict:
 
     # Find the executable graph (prompt format) for link resolution
     prompt_graph = {}
-    if prompt_str and isinstance(prompt_str, str) and prompt_str.strip().startswith('{'):
+    if prompt_str and isinstance(prompt_str, str) and looks_like_json(prompt_str):
         try:
-            data = json.loads(prompt_str)
+            data = load_json(prompt_str)
             # Handle API wrapper format where the graph is under a 'prompt' key
             if 'prompt' in data and isinstance(data.get('prompt'), dict):
                 prompt_graph = data['prompt']
@@ -383,56 +629,84 @@ def comfyui_get_data(image_info: dict) -> dict:
 
     # Find the UI graph (workflow format) for user-facing data like PrimitiveNodes
     workflow_graph = {}
-    if workflow_str and isinstance(workflow_str, str) and workflow_str.strip().startswith('{'):
+    if workflow_str and isinstance(workflow_str, str) and looks_like_json(workflow_str):
         try:
-            workflow_graph = json.loads(workflow_str)
+            workflow_graph = load_json(workflow_str)
         except json.JSONDecodeError:
             pass # Keep workflow_graph empty
 
     if not prompt_graph and not workflow_graph:
         return {}
 
+    # Intern every class_type like the lookup table keys before any link is
+    # resolved, so table probes match by identity
+    for node_details in prompt_graph.values():
+        if isinstance(node_details, dict):
+            class_type = node_details.get('class_type')
+            if type(class_type) is str:
+                node_details['class_type'] = sys.intern(class_type)
+
     try:
+        # PrimitiveNode values replace whatever Part 1 would resolve for the same
+        # field, so collect them first and skip those fields (and the deep
+        # prompt link chains behind them) while resolving.
+        primitive_overrides = {}
+        if workflow_graph and 'nodes' in workflow_graph and isinstance(workflow_graph.get('nodes'), list):
+            override_count = len(primitive_node_override_fields)
+            # Walked from the end so the last node with a title wins, as when every node was visited
+            for node in reversed(workflow_graph['nodes']):
+                if node.get('type') != 'PrimitiveNode':
+                    continue
+                field_type = primitive_node_override_fields.get(node.get('title'))
+                if field_type is None or field_type in primitive_overrides:
+                    continue
+                widgets_values = node.get('widgets_values')
+                if isinstance(widgets_values, list) and widgets_values:
+                    value = str(widgets_values[0])
+                    if value:
+                        primitive_overrides[field_type] = value
+                        if len(primitive_overrides) == override_count:
+                            break # Both prompts found, the rest of the UI graph can't change anything
+
         # --- Part 1: Extract parameters by resolving links in the executable graph ---
         if prompt_graph:
             node_dict = prompt_graph
-            target_node_instances = {}
-            for node_id, node_details in node_dict.items():
-                if isinstance(node_details, dict) and 'class_type' in node_details:
-                    target_format = resolve_class_type(node_details['class_type'], target_comfy_nodes)
-                    if target_format is not None:
-                        target_node_instances[node_id] = {
-                            'details': node_details,
-                            'required_inputs': target_format.get('inputs', []),
-                            'resolved_params': {}
-                        }
-            
-            for node_id, node_info in target_node_instances.items():
-                node_details = node_info['details']
-                node_inputs = node_details.get('inputs', {})
-                for input_key in node_info['required_inputs']:
-                    if input_key in node_inputs:
-                        resolved_value = resolve_bypasses(node_inputs[input_key], node_dict)
-                        node_info['resolved_params'][input_key] = resolved_value
-            
-            results_by_type = {key: [] for key in format_of_comfy_fields_to_types}
-            for node_id, node_info in target_node_instances.items():
-                resolved_params = node_info['resolved_params']
-                for field_type, format_strings in format_of_comfy_fields_to_types.items():
-                    for format_str in format_strings:
-                        try:
-                            formatted_value = format_str.format(**resolved_params)
-                            if formatted_value not in results_by_type[field_type]:
-                                results_by_type[field_type].append(formatted_value)
-                        except (KeyError, TypeError, ValueError):
-                            pass
+            memo: dict = {}
+            results_by_type: dict = {key: [] for key in format_of_comfy_fields_to_types}
+            seen_by_type: dict = {key: set() for key in format_of_comfy_fields_to_types}
+            # One pass: each target node is resolved and formatted right away, so
+            # only the current node's inputs are held at any time
+            for node_details in node_dict.values():
+                if not isinstance(node_details, dict):
+                    continue
+                class_type = node_details.get('class_type')
+                if not isinstance(class_type, str) or class_type not in _TARGET_TYPE_NAMES:
+                    continue
+
+                resolved_params = LazyInputs(
+                    node_details.get('inputs', {}), _TARGET_BY_TYPE[class_type].get('inputs', []), node_dict, memo
+                )
+                for field_type, required_keys, type_checks, format_fn in _FORMATS_FOR_CLASS[class_type]:
+                    if field_type in primitive_overrides:
+                        continue
+                    if not required_keys <= resolved_params.keys():
+                        continue # Node doesn't have every input this format needs
+                    if type_checks and not _has_value_types(resolved_params, type_checks):
+                        continue # e.g. {cfg:.1f} where cfg resolved to None or a string
+                    formatted_value = format_fn(resolved_params)
+                    if formatted_value is None:
+                        continue
+                    seen = seen_by_type[field_type]
+                    if formatted_value not in seen:
+                        seen.add(formatted_value)
+                        results_by_type[field_type].append(formatted_value)
 
             for field_type, values in results_by_type.items():
-                pretty_name = comfy_fields_pretty_names.get(field_type, field_type.replace('_', ' ').title())
+                pretty_name = _PRETTY[field_type]
                 for value in values:
-                    val_str = str(value)
+                    val_str = value if type(value) is str else str(value)
                     if len(val_str) > 1023:
-                        val_str = val_str[:1020] + "..."
+                        val_str = f"{val_str[:1020]}..."
                     extracted_params.append({"type": pretty_name, "val": val_str})
 
         # --- Part 2: Build final dictionary and override with PrimitiveNode data ---
@@ -440,20 +714,9 @@ def comfyui_get_data(image_info: dict) -> dict:
         for param in extracted_params:
             final[param['type']] = param['val']
 
-        if workflow_graph and 'nodes' in workflow_graph and isinstance(workflow_graph.get('nodes'), list):
-            for node in workflow_graph['nodes']:
-                if node.get('type') == 'PrimitiveNode':
-                    title = node.get('title')
-                    value = None
-                    if 'widgets_values' in node and isinstance(node.get('widgets_values'), list) and node['widgets_values']:
-                        value = str(node['widgets_values'][0])
-                    
-                    if value:
-                        if title == 'positive':
-                            final['Prompt'] = value
-                        elif title == 'negative':
-                            final['Negative Prompt'] = value
-                            
+        for field_type, value in primitive_overrides.items():
+            final[_PRETTY[field_type]] = value
+
         return final
 
     except Exception as e:
@@ -508,7 +771,7 @@ if __name__ == '__main__':
       }
     }
     """
-    parsed_data = comfyui_get_data(test_json)
+    parsed_data = comfyui_get_data({'prompt': test_json})
     print(json.dumps(parsed_data, indent=2))
     # Expected output (order might vary):
     # [
@@ -1,14 +1,17 @@
+import io
 import sys
 import json
 from PIL import Image
+from image_parser import looks_like_json, pretty_print_json
 
 def inspect_metadata(filepath, output_file=None):
     """Opens an image and prints or saves its metadata."""
     
-    output_lines = []
+    buf = io.StringIO()
 
     def write_output(content):
-        output_lines.append(str(content))
+        buf.write(content)
+        buf.write('\n')
 
     try:
         with Image.open(filepath) as img:
@@ -18,11 +21,9 @@ def inspect_metadata(filepath, output_file=None):
             else:
                 for key, value in img.info.items():
                     write_output(f"\n[+] Key: {key}")
-                    if isinstance(value, str) and value.strip().startswith('{'):
+                    if isinstance(value, str) and looks_like_json(value):
                         try:
-                            parsed_json = json.loads(value)
-                            pretty_json = json.dumps(parsed_json, indent=4)
-                            write_output(pretty_json)
+                            write_output(pretty_print_json(value))
                         except json.JSONDecodeError:
                             write_output("Value is not valid JSON, printing as raw text:")
                             write_output(value)
@@ -35,16 +36,16 @@ def inspect_metadata(filepath, output_file=None):
         write_output(f"An error occurred: {e}")
 
     # Write to file or print to console
+    data = buf.getvalue()
     if output_file:
         try:
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(output_lines))
+                f.write(data)
             print(f"Metadata has been saved to {output_file}")
         except Exception as e:
             print(f"Error writing to file {output_file}: {e}")
     else:
-        for line in output_lines:
-            print(line)
+        print(data, end='')
 
 
 if __name__ == "__main__":
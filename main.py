@@ -1,18 +1,54 @@
 import sys
 import os
 import json
-import html
+import zlib
+import hashlib
+import queue
+import itertools
+import threading
 import subprocess
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QFileDialog, QTextBrowser, QLabel, QLineEdit,
-    QScrollArea, QGridLayout, QFrame, QMenu, QSplitter
+    QListView, QStyledItemDelegate, QStyle, QMenu, QSplitter
+)
+from PySide6.QtGui import QPixmap, QImageReader, QImageWriter, QImageIOHandler, QImage, QPen, QColor, QTextDocument
+from PySide6.QtCore import (
+    Qt, QSize, QTimer, QThread, QThreadPool, QRunnable, QObject, QSemaphore, Signal,
+    QAbstractListModel, QModelIndex
 )
-from PySide6.QtGui import QPixmap, QImageReader, QPainter, QColor, QImage
-from PySide6.QtCore import Qt, QSize, QThread, Signal
 from PIL import Image
 from image_parser import comfyui_get_data
 
+try:
+    import pyvips
+    pyvips.cache_set_max(0) # Every file is thumbnailed once, don't keep decoded images or open file handles around
+except (ImportError, OSError): # Optional faster thumbnailing, OSError when the libvips library itself is missing
+    pyvips = None
+
+THUMB_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "comfy-image-browser")
+THUMB_CACHE_MAX_BYTES = 500 * 1024 * 1024
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_MAX_TEXT_BYTES = 64 * 1024 * 1024 # Decompressed size limit for a zTXt/iTXt chunk, guards against zip bombs
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp')
+SCAN_BATCH_SIZE = 256 # Found paths handed to the GUI thread per signal, as placeholders
+LOAD_PRIORITY_VISIBLE = 0
+LOAD_PRIORITY_DEFAULT = 10
+LOAD_BATCH_SIZE = 32 # Loaded images handed to the GUI thread per signal
+MAX_QUEUED_THUMBNAILS = 64 # Loaded thumbnails allowed to wait for the GUI thread before workers pause, must be >= LOAD_BATCH_SIZE
+THUMB_CACHE_VERSION = 1 # Bump when the cached thumbnails or metadata change shape
+
+PROMPT_COLOR = "#90EE90"
+NEG_PROMPT_COLOR = "#F08080"
+METADATA_ORDER = {
+    "Prompt": 0, "Negative Prompt": 1, "Model": 2, "LoRA": 3,
+    "Seed": 4, "Steps": 5, "CFG Scale": 6, "Sampler": 7,
+    "Scheduler": 8, "Denoise": 9, "Resolution": 10
+}
+HTML_ESCAPE_TABLE = str.maketrans({ # html.escape() plus newlines to <br> in a single pass
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#x27;', '\n': '<br>'
+})
+
 def open_file_location(filepath):
     """Opens the file explorer to the location of the given file."""
     filepath = os.path.normpath(filepath)
@@ -40,95 +76,579 @@ def open_image_in_system_viewer(filepath):
     except Exception as e:
         print(f"Could not open image in system viewer: {e}")
 
-class ClickableLabel(QLabel):
-    """A QLabel that emits clicked and double-clicked signals with its path."""
-    clicked = Signal(str)
-    doubleClicked = Signal(str)
-
-    def __init__(self, path, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.path = path
+class ThumbCache:
+    """
+    On-disk cache of thumbnails and their parsed metadata, so reopening a
+    directory skips decoding, scaling and parsing for unchanged files.
+    Entries are keyed by file path, mtime and size plus the thumbnail size.
+    """
+
+    def __init__(self, cache_dir=THUMB_CACHE_DIR, max_bytes=THUMB_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        supported = {bytes(fmt).decode().lower() for fmt in QImageWriter.supportedImageFormats()}
+        self.image_format = "WEBP" if "webp" in supported else "PNG"
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError as e:
+            print(f"Thumbnail cache disabled, could not create {cache_dir}: {e}")
+            self.cache_dir = None
+
+    def _entry_path(self, filepath, size):
+        st = os.stat(filepath)
+        key = f"{THUMB_CACHE_VERSION}|{os.path.abspath(filepath)}|{int(st.st_mtime)}|{st.st_size}|{size.width()}x{size.height()}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def get(self, filepath, size):
+        """Returns (thumbnail, info) for a cached file, or None on a miss."""
+        if self.cache_dir is None:
+            return None
+        try:
+            entry = self._entry_path(filepath, size)
+            with open(entry + ".json", 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(info, dict) or 'metadata' not in info or 'resolution' not in info:
+            return None # Not written by put(), decode the file again and overwrite it
+        image_path = entry + "." + self.image_format.lower()
+        thumbnail = QImage(image_path)
+        if thumbnail.isNull():
+            return None
+        # Mark the entry as used for prune(). Reads alone don't update atime on
+        # Windows (off by default on NTFS) or on noatime mounts
+        try:
+            os.utime(entry + ".json")
+            os.utime(image_path)
+        except OSError:
+            pass
+        return thumbnail, info
+
+    def put(self, filepath, size, thumbnail, info):
+        """Stores a thumbnail and its info dict (metadata and resolution)."""
+        if self.cache_dir is None:
+            return
+        try:
+            entry = self._entry_path(filepath, size)
+            image_path = entry + "." + self.image_format.lower()
+            # Write to temp files and rename, so a half-written entry is never read back.
+            # The .json goes last since get() treats it as the marker of a complete entry
+            if not thumbnail.save(image_path + ".tmp", self.image_format, 85):
+                return
+            os.replace(image_path + ".tmp", image_path)
+            with open(entry + ".json.tmp", 'w', encoding='utf-8') as f:
+                json.dump(info, f)
+            os.replace(entry + ".json.tmp", entry + ".json")
+        except OSError as e:
+            print(f"Could not write thumbnail cache for {os.path.basename(filepath)}: {e}")
+
+    def prune(self):
+        """Deletes least recently used files until the cache is under max_bytes."""
+        if self.cache_dir is None:
+            return
+        try:
+            files = []
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file():
+                        st = entry.stat()
+                        files.append((st.st_atime, st.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.max_bytes:
+                break
 
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.clicked.emit(self.path)
+class ThumbModel(QAbstractListModel):
+    """
+    List model behind the thumbnail grid, one row per found image in scan
+    order. A row's pixmap is None until its thumbnail has loaded.
+    """
+    PathRole = Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paths = []
+        self.names = [] # File names, for placeholder text and for searching rows that haven't loaded yet
+        self.lower_names = []
+        self.pixmaps = []
+        self.rows = {} # path -> row
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DecorationRole:
+            return self.pixmaps[row]
+        if role == Qt.DisplayRole:
+            return self.names[row]
+        if role == ThumbModel.PathRole:
+            return self.paths[row]
+        return None
+
+    def add_images(self, paths):
+        first = len(self.paths)
+        self.beginInsertRows(QModelIndex(), first, first + len(paths) - 1)
+        for row, path in enumerate(paths, first):
+            self.rows[path] = row
+            name = os.path.basename(path)
+            self.names.append(name)
+            self.lower_names.append(name.lower())
+        self.paths.extend(paths)
+        self.pixmaps.extend([None] * len(paths))
+        self.endInsertRows()
+
+    def set_pixmaps(self, rows, pixmaps):
+        for row, pixmap in zip(rows, pixmaps):
+            self.pixmaps[row] = pixmap
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)), [Qt.DecorationRole])
+
+    def clear(self):
+        self.beginResetModel()
+        self.paths.clear()
+        self.names.clear()
+        self.lower_names.clear()
+        self.pixmaps.clear()
+        self.rows.clear()
+        self.endResetModel()
+
+class ThumbDelegate(QStyledItemDelegate):
+    """
+    Paints a thumbnail letterboxed on black in a fixed size cell, with a
+    border when selected. Rows still waiting for their thumbnail show the
+    file name and are reported through placeholder_painted, the view only
+    paints what is on screen so that tells what to load next.
+    """
+    placeholder_painted = Signal(str)
+
+    def __init__(self, cell_size, parent=None):
+        super().__init__(parent)
+        self.cell_size = cell_size
+
+    def sizeHint(self, option, index):
+        return self.cell_size
+
+    def paint(self, painter, option, index):
+        rect = option.rect
+        painter.fillRect(rect, Qt.black)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is not None and not pixmap.isNull():
+            x = rect.x() + (rect.width() - pixmap.width()) // 2
+            y = rect.y() + (rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.setPen(QColor('white'))
+            painter.drawText(rect, Qt.AlignCenter | Qt.TextWrapAnywhere, index.data(Qt.DisplayRole))
+            self.placeholder_painted.emit(index.data(ThumbModel.PathRole))
+        if option.state & QStyle.State_Selected:
+            hacker_green = "#39FF14"
+            painter.setPen(QPen(QColor(hacker_green), 2))
+            painter.drawRect(rect.adjusted(1, 1, -1, -1))
 
-    def mouseDoubleClickEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.doubleClicked.emit(self.path)
+class ThumbView(QListView):
+    """Icon mode list view of thumbnails that offers "Open File Location" on right click."""
 
     def contextMenuEvent(self, event):
+        index = self.indexAt(event.pos())
+        if not index.isValid():
+            return
         menu = QMenu(self)
         open_action = menu.addAction("Open File Location")
-        action = menu.exec(self.mapToGlobal(event.pos()))
+        action = menu.exec(event.globalPos())
         if action == open_action:
-            open_file_location(self.path)
+            open_file_location(index.data(ThumbModel.PathRole))
+
+def load_vips_thumbnail(filepath, thumbnail_size):
+    """Decodes and shrinks the image in a single libvips call, or returns None if libvips can't read it."""
+    try:
+        image = pyvips.Image.thumbnail(filepath, thumbnail_size.width(), height=thumbnail_size.height(), size='down')
+        if image.interpretation != 'srgb':
+            image = image.colourspace('srgb') # Greyscale and 16-bit images to 8-bit sRGB
+        if image.bands == 4:
+            image_format, bytes_per_pixel = QImage.Format_RGBA8888, 4
+        else:
+            image = image[:3]
+            image_format, bytes_per_pixel = QImage.Format_RGB888, 3
+        data = image.cast('uchar').write_to_memory()
+        return QImage(data, image.width, image.height, image.width * bytes_per_pixel, image_format).copy()
+    except pyvips.Error:
+        return None
+
+def load_qt_thumbnail(filepath, thumbnail_size):
+    """Decodes the image with Qt and scales it down to the thumbnail size, or returns None if Qt can't read it."""
+    reader = QImageReader(filepath)
+    source_size = reader.size()
+    if source_size.isValid() and reader.supportsOption(QImageIOHandler.ImageOption.ScaledSize):
+        # The plugin decodes straight at the target size (libjpeg scales in the DCT) instead of at full resolution
+        reader.setScaledSize(source_size.scaled(thumbnail_size, Qt.KeepAspectRatio))
+        scaled_image = reader.read()
+        return None if scaled_image.isNull() else scaled_image
+
+    source_image = reader.read()
+    if source_image.isNull():
+        return None
+    prescale_size = thumbnail_size * 2
+    if source_image.width() > prescale_size.width() or source_image.height() > prescale_size.height():
+        # A cheap nearest-neighbour pass to 2x first, so the smooth pass only filters a few pixels per output pixel
+        source_image = source_image.scaled(prescale_size, Qt.KeepAspectRatio, Qt.FastTransformation)
+    return source_image.scaled(thumbnail_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+def _inflate_png_text(data):
+    inflater = zlib.decompressobj()
+    text = inflater.decompress(data, PNG_MAX_TEXT_BYTES)
+    if inflater.unconsumed_tail:
+        raise ValueError("PNG text chunk too large")
+    return text
+
+def read_png_info(filepath):
+    """
+    Reads the text chunks and size of a PNG without handing the file to an
+    image decoder. Stops at the first IDAT, like Image.open() does, and
+    decodes values the same way Pillow fills `info`. Returns (info, (width,
+    height)), or None if the file isn't a well formed PNG.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            if f.read(8) != PNG_SIGNATURE:
+                return None
+            info = {}
+            size = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                length = int.from_bytes(header[:4], 'big')
+                chunk_type = header[4:]
+                if chunk_type == b'IDAT' or chunk_type == b'IEND':
+                    break
+                if chunk_type == b'IHDR' or chunk_type == b'tEXt' or chunk_type == b'zTXt' or chunk_type == b'iTXt':
+                    data = f.read(length)
+                    f.seek(4, os.SEEK_CUR) # CRC
+                else:
+                    f.seek(length + 4, os.SEEK_CUR)
+                    continue
+
+                if chunk_type == b'IHDR':
+                    size = (int.from_bytes(data[0:4], 'big'), int.from_bytes(data[4:8], 'big'))
+                    continue
+                keyword, _, value = data.partition(b'\x00')
+                key = keyword.decode('latin-1')
+                if chunk_type == b'tEXt':
+                    info[key] = value.decode('latin-1')
+                elif chunk_type == b'zTXt':
+                    info[key] = _inflate_png_text(value[1:]).decode('latin-1')
+                else: # iTXt: compression flag, method, language\0, translated keyword\0, UTF-8 text
+                    compressed = value[:1] == b'\x01'
+                    _language, _, rest = value[2:].partition(b'\x00')
+                    _translated, _, text = rest.partition(b'\x00')
+                    if compressed:
+                        text = _inflate_png_text(text)
+                    info[key] = text.decode('utf-8', errors='replace')
+    except (OSError, ValueError, zlib.error):
+        return None
+    if size is None:
+        return None
+    return info, size
+
+def to_pixmap_format(image):
+    """
+    Converts a thumbnail to the pixel format QPixmap stores on the raster
+    backend, so QPixmap.fromImage() on the GUI thread is a cheap copy
+    instead of a per-pixel conversion.
+    """
+    pixmap_format = QImage.Format_ARGB32_Premultiplied if image.hasAlphaChannel() else QImage.Format_RGB32
+    if image.format() == pixmap_format:
+        return image
+    return image.convertToFormat(pixmap_format)
+
+def build_search_text(filepath, metadata):
+    """Lowercased text the search bar matches against, the metadata JSON plus the file name."""
+    return (json.dumps(metadata) + '\n' + os.path.basename(filepath)).lower()
+
+def load_image_data(filepath, thumbnail_size, thumb_cache):
+    """Builds the thumbnail, metadata and resolution for one image file, or returns None if it can't be read."""
+    cached = thumb_cache.get(filepath, thumbnail_size)
+    if cached is not None:
+        scaled_image, info = cached
+        return {
+            'path': filepath,
+            'metadata': info['metadata'],
+            'resolution': info['resolution'],
+            'thumbnail_image': to_pixmap_format(scaled_image),
+            'searchable': build_search_text(filepath, info['metadata'])
+        }
 
-class ImageLoader(QThread):
-    image_loaded = Signal(dict)
-    finished = Signal()
+    try:
+        png_info = read_png_info(filepath) if filepath.lower().endswith('.png') else None
+        if png_info is not None:
+            info_dict, (width, height) = png_info
+        else:
+            with Image.open(filepath) as pil_img:
+                info_dict = pil_img.info
+                width, height = pil_img.size
+
+        scaled_image = None
+        if pyvips is not None:
+            scaled_image = load_vips_thumbnail(filepath, thumbnail_size)
+        if scaled_image is None:
+            scaled_image = load_qt_thumbnail(filepath, thumbnail_size)
+            if scaled_image is None:
+                print(f"Could not load image {os.path.basename(filepath)}")
+                return None
+        scaled_image = to_pixmap_format(scaled_image)
+
+        metadata = {}
+        if 'prompt' in info_dict or 'workflow' in info_dict: # The only keys comfyui_get_data reads, EXIF-only JPEGs/WebPs have neither
+            try:
+                metadata = comfyui_get_data(info_dict)
+            except Exception as e:
+                print(f"Could not parse metadata for {os.path.basename(filepath)}: {e}")
+
+        resolution = f"{width}x{height}"
+        thumb_cache.put(filepath, thumbnail_size, scaled_image, {
+            'metadata': metadata,
+            'resolution': resolution
+        })
+        return {
+            'path': filepath,
+            'metadata': metadata,
+            'resolution': resolution,
+            'thumbnail_image': scaled_image,
+            'searchable': build_search_text(filepath, metadata)
+        }
+    except Exception as e:
+        print(f"Could not read image for metadata {os.path.basename(filepath)}: {e}")
+        return None
+
+def iter_images(root, is_cancelled=lambda: False):
+    """
+    Yields the path of every image under root, recursing into subdirectories without following symlinks.
+    Stops early once is_cancelled() returns True, which is checked per directory and per entry.
+    """
+    if is_cancelled():
+        return
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if is_cancelled():
+                    return
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_images(entry.path, is_cancelled)
+                elif entry.name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield entry.path
+    except OSError as e:
+        print(f"Could not read directory {root}: {e}")
+
+class ScanJob(QRunnable):
+    """Walks the loader's directory on its thread pool, handing found images to the loader in batches."""
+
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
 
-    def __init__(self, directory, thumbnail_size):
+    def run(self):
+        loader = self.loader
+        try:
+            found = []
+            for filepath in iter_images(loader.directory, lambda: loader.cancelled):
+                found.append(filepath)
+                if len(found) >= SCAN_BATCH_SIZE:
+                    loader.add_found(found)
+                    found = []
+            if found and not loader.cancelled:
+                loader.add_found(found)
+        finally:
+            loader.scan_done = True
+            loader.job_done()
+
+class ThumbWorker(QRunnable):
+    """Loads images off the loader's priority queue until the scan is done and the queue is empty."""
+
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+
+    def run(self):
+        loader = self.loader
+        try:
+            while True:
+                filepath = loader.next_image()
+                if filepath is None:
+                    return
+                try:
+                    image_data = load_image_data(filepath, loader.thumbnail_size, loader.thumb_cache)
+                except Exception as e: # Lose only this image, not the rest of the worker's queue
+                    print(f"Could not load {os.path.basename(filepath)}: {e}")
+                    image_data = None
+                if loader.acquire_slot():
+                    loader.add_result(filepath, image_data)
+        finally:
+            loader.job_done()
+
+class ImageLoader(QObject):
+    """
+    Loads every image under a directory on a QThreadPool so decoding and
+    scaling use all cores. A ScanJob walks the directory and reports the
+    paths it finds through images_found, so the grid can show placeholders
+    right away, and queues them for the ThumbWorkers. Workers take the
+    lowest (priority, sequence) entry first, prioritize() moves images the
+    user is looking at to the front.
+
+    Results are collected into lists of (path, image data or None if it
+    couldn't be loaded) of LOAD_BATCH_SIZE and emitted from the pool
+    threads, delivered queued to the GUI thread. At most
+    MAX_QUEUED_THUMBNAILS results can be waiting there, the receiver calls
+    release_slot() for each one consumed.
+    """
+    images_found = Signal(list)
+    image_loaded = Signal(list)
+
+    def __init__(self, directory, thumbnail_size, thumb_cache):
         super().__init__()
         self.directory = directory
-        self.running = True
         self.thumbnail_size = thumbnail_size
+        self.thumb_cache = thumb_cache
+        self.running = False
+        self.cancelled = False
+        self.scan_done = False
+        self._pending_jobs = 0
+        self._batch = []
+        self._lock = threading.Lock()
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._taken = set() # Paths a worker has picked up, later duplicate entries are skipped
+        self._prioritized = set()
+        self._queue_slots = QSemaphore(MAX_QUEUED_THUMBNAILS)
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max(2, QThread.idealThreadCount() - 2))
+
+    def start(self):
+        self.running = True
+        worker_count = self.pool.maxThreadCount()
+        self._pending_jobs = worker_count + 1
+        self.pool.start(ScanJob(self))
+        for _ in range(worker_count):
+            self.pool.start(ThumbWorker(self))
+
+    def add_found(self, filepaths):
+        self.images_found.emit(filepaths) # Before queueing, so placeholders exist when results arrive
+        for filepath in filepaths:
+            self._queue.put((LOAD_PRIORITY_DEFAULT, next(self._sequence), filepath))
+
+    def prioritize(self, filepaths):
+        """Moves images to the front of the queue, e.g. because their placeholders are on screen."""
+        for filepath in filepaths:
+            if filepath not in self._prioritized:
+                self._prioritized.add(filepath)
+                self._queue.put((LOAD_PRIORITY_VISIBLE, next(self._sequence), filepath))
+
+    def next_image(self):
+        """Returns the next path to load, or None once everything has been loaded or loading was cancelled."""
+        while not self.cancelled:
+            scan_done = self.scan_done # Read before get(), so an empty queue afterwards really means nothing is left
+            try:
+                _, _, filepath = self._queue.get(timeout=0.1)
+            except queue.Empty:
+                if scan_done:
+                    return None
+                continue
+            with self._lock:
+                if filepath in self._taken:
+                    continue
+                self._taken.add(filepath)
+            return filepath
+        return None
+
+    def job_done(self):
+        with self._lock:
+            self._pending_jobs -= 1
+            last_job = self._pending_jobs == 0
+        if last_job:
+            self._flush()
+            self._finish()
+
+    def add_result(self, filepath, image_data):
+        with self._lock:
+            self._batch.append((filepath, image_data))
+            if len(self._batch) < LOAD_BATCH_SIZE:
+                return
+            batch, self._batch = self._batch, []
+        self.image_loaded.emit(batch)
+
+    def _flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, []
+        if batch and not self.cancelled:
+            self.image_loaded.emit(batch)
+
+    def acquire_slot(self):
+        """Blocks a worker until the GUI has room for another result, returns False if loading was cancelled meanwhile."""
+        while not self._queue_slots.tryAcquire(1, 100):
+            if self.cancelled:
+                return False
+        if self.cancelled:
+            self._queue_slots.release()
+            return False
+        return True
+
+    def release_slot(self, count=1):
+        self._queue_slots.release(count)
+
+    def _finish(self):
+        self.thumb_cache.prune()
+        self.running = False
 
-    def run(self):
-        valid_extensions = {'.png', '.jpg', '.jpeg', '.webp'}
-        
-        for root, _, files in os.walk(self.directory):
-            if not self.running:
-                break
-            for filename in files:
-                if not self.running:
-                    break
-                
-                ext = os.path.splitext(filename)[1].lower()
-                if ext in valid_extensions:
-                    filepath = os.path.join(root, filename)
-                    
-                    source_image = QImage(filepath)
-                    if source_image.isNull():
-                        print(f"Could not load image {os.path.basename(filepath)}")
-                        continue
-
-                    scaled_image = source_image.scaled(self.thumbnail_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                    
-                    try:
-                        info_dict = {}
-                        width, height = 0, 0
-                        with Image.open(filepath) as pil_img:
-                            info_dict = pil_img.info
-                            width, height = pil_img.size
-
-                        metadata = {}
-                        if info_dict:
-                            try:
-                                metadata = comfyui_get_data(info_dict)
-                            except Exception as e:
-                                print(f"Could not parse metadata for {os.path.basename(filepath)}: {e}")
-
-                        self.image_loaded.emit({
-                            'path': filepath,
-                            'metadata': metadata,
-                            'resolution': f"{width}x{height}",
-                            'thumbnail_image': scaled_image
-                        })
-                    except Exception as e:
-                        print(f"Could not read image for metadata {os.path.basename(filepath)}: {e}")
-
-        self.finished.emit()
+    def isRunning(self):
+        return self.running
 
     def stop(self):
+        # Jobs see `cancelled` and return, including ones still waiting for a
+        # thread, which must run so job_done() counts them
+        self.cancelled = True
+
+    def wait(self):
+        self.pool.waitForDone()
         self.running = False
 
+def render_metadata_html(metadata, resolution):
+    """Renders an image's metadata for the metadata panel, or returns None if there is nothing to show."""
+    if resolution:
+        metadata = {**metadata, 'Resolution': resolution}
+    if not metadata:
+        return None
+
+    parts = []
+    for key in sorted(metadata, key=lambda k: (METADATA_ORDER.get(k, 99), k)):
+        value = metadata[key]
+        color = "white"
+        if key == "Prompt":
+            color = PROMPT_COLOR
+        elif key == "Negative Prompt":
+            color = NEG_PROMPT_COLOR
+
+        escaped_value = str(value).translate(HTML_ESCAPE_TABLE)
+        parts.append(f"<p style='margin-bottom: 10px; color:{color};'><b>{key}:</b><br>{escaped_value}</p>")
+
+    return f"<html><body style='color:white; font-family: sans-serif; font-size: 14px;'>{''.join(parts)}</body></html>"
+
 class ImageBrowser(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Comfy Image Browser")
         self.setGeometry(100, 100, 1600, 900)
-        self.selected_widget = None
+        self.thumbnail_size = QSize(256, 256)
 
         splitter = QSplitter(Qt.Horizontal)
         self.setCentralWidget(splitter)
@@ -142,189 +662,168 @@ class ImageBrowser(QMainWindow):
         
         self.search_bar = QLineEdit()
         self.search_bar.setPlaceholderText("Search all metadata...")
-        self.search_bar.textChanged.connect(self.filter_images)
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(150) # Filter once typing pauses rather than on every keystroke
+        self._filter_timer.timeout.connect(self.filter_images)
+        self.search_bar.textChanged.connect(self._filter_timer.start)
         left_layout.addWidget(self.search_bar)
 
         self.metadata_display = QTextBrowser()
         self.metadata_display.setOpenExternalLinks(True)
+        # The panel shows each image's cached document, clear() would wipe whichever one is current
+        self.blank_metadata_document = QTextDocument(self)
+        self.metadata_display.setDocument(self.blank_metadata_document)
         left_layout.addWidget(QLabel("Metadata:"))
         left_layout.addWidget(self.metadata_display)
 
         right_panel = QWidget()
         right_layout = QVBoxLayout(right_panel)
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_widget = QWidget()
-        self.image_grid_layout = QGridLayout(self.scroll_widget)
-        self.image_grid_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        self.scroll_area.setWidget(self.scroll_widget)
-        right_layout.addWidget(self.scroll_area)
+        self.thumb_model = ThumbModel(self)
+        self.image_view = ThumbView()
+        self.image_view.setModel(self.thumb_model)
+        self.thumb_delegate = ThumbDelegate(self.thumbnail_size, self.image_view)
+        self.thumb_delegate.placeholder_painted.connect(self.on_placeholder_painted)
+        self.image_view.setItemDelegate(self.thumb_delegate)
+        # Icon mode only lays out and paints the visible cells, and reflows on resize by itself
+        self.image_view.setViewMode(QListView.IconMode)
+        self.image_view.setResizeMode(QListView.Adjust)
+        self.image_view.setMovement(QListView.Static)
+        self.image_view.setUniformItemSizes(True)
+        self.image_view.setLayoutMode(QListView.Batched)
+        self.image_view.setSpacing(5)
+        self.image_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOn)
+        self.image_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.image_view.clicked.connect(self.on_thumbnail_clicked)
+        self.image_view.doubleClicked.connect(self.on_thumbnail_double_clicked)
+        right_layout.addWidget(self.image_view)
 
         splitter.addWidget(left_panel)
         splitter.addWidget(right_panel)
         splitter.setSizes([350, 1250])
 
-        self.images_data = []
-        self.image_widgets = []
-        self.image_loader_thread = None
-        self.thumbnail_size = QSize(256, 256)
-        self._loading_columns = 0
+        self.images_data = {} # path -> image data from load_image_data, minus the thumbnail the model holds
+        self.failed_paths = set()
+        self.image_loader = None
+        self.thumb_cache = ThumbCache()
+        self._visible_placeholders = set()
+        self._priority_timer = QTimer(self)
+        self._priority_timer.setSingleShot(True)
+        self._priority_timer.setInterval(50) # Collect a whole repaint's worth of placeholders before reprioritizing
+        self._priority_timer.timeout.connect(self.prioritize_visible)
 
     def closeEvent(self, event):
-        if self.image_loader_thread and self.image_loader_thread.isRunning():
-            self.image_loader_thread.stop()
-            self.image_loader_thread.wait()
+        if self.image_loader and self.image_loader.isRunning():
+            self.image_loader.stop()
+            self.image_loader.wait()
         super().closeEvent(event)
 
     def open_image_viewer(self, image_path):
         open_image_in_system_viewer(image_path)
 
+    def on_thumbnail_clicked(self, index):
+        self.display_image_metadata(index.data(ThumbModel.PathRole))
+
+    def on_thumbnail_double_clicked(self, index):
+        self.open_image_viewer(index.data(ThumbModel.PathRole))
+
     def select_directory(self):
         directory = QFileDialog.getExistingDirectory(self, "Select Image Directory")
         if directory:
             self.load_images(directory)
 
     def load_images(self, directory):
-        for i in reversed(range(self.image_grid_layout.count())): 
-            self.image_grid_layout.itemAt(i).widget().setParent(None)
+        self.metadata_display.setDocument(self.blank_metadata_document) # Before the documents in images_data are freed
+        self.thumb_model.clear()
         self.images_data.clear()
-        self.image_widgets.clear()
-        self.metadata_display.clear()
-        self.selected_widget = None
-
-        if self.image_loader_thread and self.image_loader_thread.isRunning():
-            self.image_loader_thread.stop()
-            self.image_loader_thread.wait()
-
-        self._loading_columns = self.calculate_columns()
-        self.image_loader_thread = ImageLoader(directory, self.thumbnail_size)
-        self.image_loader_thread.image_loaded.connect(self.add_image_to_grid)
-        self.image_loader_thread.finished.connect(self.on_loading_finished)
-        self.image_loader_thread.start()
-
-    def on_loading_finished(self):
-        self._loading_columns = 0
-        self.reorganize_grid()
-
-    def add_image_to_grid(self, image_data):
-        self.images_data.append(image_data)
-        path = image_data['path']
-        widget = ClickableLabel(path)
-        widget.setFixedSize(self.thumbnail_size)
-        widget.setFrameShape(QFrame.StyledPanel)
-        widget.setAlignment(Qt.AlignCenter)
-
-        widget.clicked.connect(self.display_image_metadata)
-        widget.doubleClicked.connect(self.open_image_viewer)
-        
-        scaled_image = image_data.get('thumbnail_image')
-        if scaled_image and not scaled_image.isNull():
-            final_pixmap = QPixmap(self.thumbnail_size)
-            final_pixmap.fill(QColor('black'))
-            
-            scaled_pixmap = QPixmap.fromImage(scaled_image)
-
-            painter = QPainter(final_pixmap)
-            x = (final_pixmap.width() - scaled_pixmap.width()) / 2
-            y = (final_pixmap.height() - scaled_pixmap.height()) / 2
-            painter.drawPixmap(int(x), int(y), scaled_pixmap)
-            painter.end()
-            widget.setPixmap(final_pixmap)
-        else:
-            widget.setText(os.path.basename(path))
-        
-        columns = self._loading_columns
-        if columns == 0: columns = 1
-        row = len(self.image_widgets) // columns
-        col = len(self.image_widgets) % columns
-        self.image_grid_layout.addWidget(widget, row, col)
-        self.image_widgets.append(widget)
-        widget.setProperty("image_path", path)
-
-    def display_image_metadata(self, image_path):
-        clicked_widget = None
-        for widget in self.image_widgets:
-            if widget.path == image_path:
-                clicked_widget = widget
-                break
+        self.failed_paths.clear()
+        self._visible_placeholders.clear()
+
+        if self.image_loader and self.image_loader.isRunning():
+            self.image_loader.stop()
+            self.image_loader.wait()
+
+        self.image_loader = ImageLoader(directory, self.thumbnail_size, self.thumb_cache)
+        self.image_loader.images_found.connect(self.add_placeholders)
+        self.image_loader.image_loaded.connect(self.add_thumbnails)
+        self.image_loader.start()
+
+    def on_placeholder_painted(self, image_path):
+        self._visible_placeholders.add(image_path)
+        if not self._priority_timer.isActive():
+            self._priority_timer.start()
+
+    def prioritize_visible(self):
+        if self.image_loader and self.image_loader.isRunning():
+            self.image_loader.prioritize(self._visible_placeholders)
+        self._visible_placeholders.clear()
+
+    def add_placeholders(self, paths):
+        if self.sender() is not self.image_loader:
+            return # Queued results from a loader that was replaced by a directory switch
+        search_text = self.search_bar.text().lower()
+        first_row = self.thumb_model.rowCount()
+        self.thumb_model.add_images(paths) # One row insert, and so one view relayout, for the whole batch
+        if search_text:
+            for row in range(first_row, self.thumb_model.rowCount()):
+                if not self.matches_search(row, search_text):
+                    self.image_view.setRowHidden(row, True)
+
+    def add_thumbnails(self, batch):
+        if self.sender() is not self.image_loader:
+            return
+        search_text = self.search_bar.text().lower()
+        rows = []
+        pixmaps = []
+        for path, image_data in batch:
+            row = self.thumb_model.rows[path]
+            if image_data is None:
+                self.failed_paths.add(path)
+                self.image_view.setRowHidden(row, True)
+                continue
+            scaled_image = image_data.pop('thumbnail_image')
+            self.images_data[path] = image_data
+            rows.append(row)
+            pixmaps.append(QPixmap.fromImage(scaled_image))
+            if search_text:
+                self.image_view.setRowHidden(row, not self.matches_search(row, search_text))
 
-        if clicked_widget:
-            if self.selected_widget and self.selected_widget != clicked_widget:
-                self.selected_widget.setStyleSheet("")
-            
-            hacker_green = "#39FF14"
-            clicked_widget.setStyleSheet(f"border: 2px solid {hacker_green};")
-            self.selected_widget = clicked_widget
+        self.thumb_model.set_pixmaps(rows, pixmaps)
+        self.image_loader.release_slot(len(batch))
 
-        self.metadata_display.clear()
-        image_info = next((item for item in self.images_data if item['path'] == image_path), None)
-        
-        if image_info:
-            if image_info.get('resolution'):
-                image_info['metadata']['Resolution'] = image_info['resolution']
-
-            html_output = ""
-            if image_info['metadata']:
-                prompt_color = "#90EE90"
-                neg_prompt_color = "#F08080"
-                order_map = {
-                    "Prompt": 0, "Negative Prompt": 1, "Model": 2, "LoRA": 3,
-                    "Seed": 4, "Steps": 5, "CFG Scale": 6, "Sampler": 7,
-                    "Scheduler": 8, "Denoise": 9, "Resolution": 10
-                }
-                
-                sorted_keys = sorted(
-                    image_info['metadata'].keys(), 
-                    key=lambda k: (order_map.get(k, 99), k)
-                )
-
-                for key in sorted_keys:
-                    value = image_info['metadata'][key]
-                    color = "white"
-                    if key == "Prompt":
-                        color = prompt_color
-                    elif key == "Negative Prompt":
-                        color = neg_prompt_color
-                    
-                    escaped_value = html.escape(str(value)).replace('\n', '<br>')
-                    html_output += f"<p style='margin-bottom: 10px; color:{color};'><b>{key}:</b><br>{escaped_value}</p>"
-
-                self.metadata_display.setHtml(f"<html><body style='color:white; font-family: sans-serif; font-size: 14px;'>{html_output}</body></html>")
+    def display_image_metadata(self, image_path):
+        image_info = self.images_data.get(image_path)
+        if not image_info:
+            self.metadata_display.setDocument(self.blank_metadata_document)
+            return
+
+        document = image_info.get('document')
+        if document is None: # Built on first view, clicking back to an image just swaps the laid out document in
+            document = QTextDocument()
+            html_output = render_metadata_html(image_info['metadata'], image_info.get('resolution'))
+            if html_output:
+                document.setHtml(html_output)
             else:
-                self.metadata_display.setText("No ComfyUI metadata found.")
+                document.setPlainText("No ComfyUI metadata found.")
+            image_info['document'] = document
+        self.metadata_display.setDocument(document)
+
+    def matches_search(self, row, search_text):
+        image_path = self.thumb_model.paths[row]
+        if image_path in self.failed_paths:
+            return False
+        image_info = self.images_data.get(image_path)
+        if image_info is None: # Not loaded yet, only the file name is known
+            return search_text in self.thumb_model.lower_names[row]
+        return search_text in image_info['searchable']
 
     def filter_images(self):
         search_text = self.search_bar.text().lower()
-        
-        for widget in self.image_widgets:
-            image_path = widget.property("image_path")
-            if not image_path:
-                continue
-                
-            image_info = next((item for item in self.images_data if item['path'] == image_path), None)
-            
-            if image_info:
-                metadata_str = json.dumps(image_info['metadata']).lower()
-                
-                if search_text in metadata_str or search_text in os.path.basename(image_path).lower():
-                    widget.show()
-                else:
-                    widget.hide()
-
-    def calculate_columns(self):
-        return max(1, self.scroll_area.width() // (self.thumbnail_size.width() + 10))
-
-    def resizeEvent(self, event):
-        super().resizeEvent(event)
-        self.reorganize_grid()
 
-    def reorganize_grid(self):
-        columns = self.calculate_columns()
-        for i, widget in enumerate(self.image_widgets):
-            row = i // columns
-            col = i % columns
-            self.image_grid_layout.addWidget(widget, row, col)
+        self.image_view.setUpdatesEnabled(False) # One relayout for the whole pass instead of one per row
+        for row in range(self.thumb_model.rowCount()):
+            self.image_view.setRowHidden(row, not self.matches_search(row, search_text))
+        self.image_view.setUpdatesEnabled(True)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -350,7 +849,7 @@ if __name__ == "__main__":
         QPushButton:pressed {
             background-color: #6a6a6a;
         }
-        QLineEdit, QTextBrowser, QScrollArea {
+        QLineEdit, QTextBrowser, QListView {
             background-color: #3c3c3c;
             border-radius: 4px;
             padding: 5px;